@@ -1,11 +1,23 @@
+import functools
 import os
+import types
+from typing import Mapping
 from dotenv import load_dotenv
 
+
+@functools.lru_cache(maxsize=None)
+def _load_env(env_file: str = ".env") -> Mapping[str, str]:
+    """Load the env file once and return a read-only snapshot of the environment."""
+    load_dotenv(env_file)
+    return types.MappingProxyType(dict(os.environ))
+
+
 class EnvConfig:
     def __init__(self, env_file: str = ".env"):
-        # Load environment variables from file
-        load_dotenv(env_file)
+        # Load environment variables from file (only parsed once per process)
+        self.env_file = env_file
+        _load_env(env_file)
 
     def get(self, key: str, default=None):
         """Return the value of the environment variable or default if not found."""
-        return os.getenv(key, default)
\ No newline at end of file
+        return _load_env(self.env_file).get(key, default)
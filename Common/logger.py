@@ -1,39 +1,176 @@
+import atexit
+import functools
 import logging
-from logging.handlers import RotatingFileHandler
+import multiprocessing
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener, RotatingFileHandler
+from typing import Any, Dict, List, Optional, Tuple
+
+
+@functools.lru_cache(maxsize=None)
+def get_logger(name: str = "animal_apis", log_file: str = "app.log", level: int = logging.INFO) -> logging.Logger:
+    """
+    Return a configured logger, creating its handlers only on the first call.
+
+    Results are cached per (name, log_file, level), so every module asking for
+    the same logger gets the same instance without re-running the setup.
+
+    Args:
+        name (str): Logger name
+        log_file (str): Path to log file
+        level (int): Logging level
+
+    Returns:
+        logging.Logger: The configured logger
+    """
+    logger = logging.getLogger(name)
+    logger.setLevel(level)
+
+    # Avoid duplicate handlers if the logger was configured elsewhere
+    if not logger.handlers:
+        # Console handler
+        console_handler = logging.StreamHandler()
+        console_handler.setLevel(level)
+
+        # File handler with rotation
+        file_handler = RotatingFileHandler(log_file, maxBytes=5_000_000, backupCount=5)
+        file_handler.setLevel(level)
+
+        # Formatter
+        formatter = logging.Formatter(
+            "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+        )
+        console_handler.setFormatter(formatter)
+        file_handler.setFormatter(formatter)
+
+        # Buffer file writes; flush every 1024 records, on errors and at exit
+        buffered_handler = MemoryHandler(
+            capacity=1024,
+            flushLevel=logging.ERROR,
+            target=file_handler,
+            flushOnClose=True
+        )
+        buffered_handler.setLevel(level)
+        atexit.register(buffered_handler.flush)
+
+        # Add handlers
+        logger.addHandler(console_handler)
+        logger.addHandler(buffered_handler)
+
+    return logger
+
+
+# Running listeners, keyed by logger name, with the handlers they took over
+_listeners: Dict[str, Tuple[QueueListener, QueueHandler, List[logging.Handler]]] = {}
+
+
+def start_queue_listener(name: str = "animal_apis") -> None:
+    """
+    Move a logger's handlers onto a background thread.
+
+    The logger's handlers are replaced by a single QueueHandler, and a
+    QueueListener thread formats and writes the queued records, so logging
+    calls made on the event loop don't block on formatting or I/O. The queue
+    is a multiprocessing queue, so worker processes can log through it too
+    (see :func:`attach_to_listener`).
+
+    Args:
+        name (str): Logger name
+    """
+    if name in _listeners:
+        return
+
+    logger = logging.getLogger(name)
+    handlers = list(logger.handlers)
+    queue_handler = QueueHandler(multiprocessing.Queue())
+    listener = QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+
+    for handler in handlers:
+        logger.removeHandler(handler)
+    logger.addHandler(queue_handler)
+    listener.start()
+    _listeners[name] = (listener, queue_handler, handlers)
+
+
+def stop_queue_listener(name: str = "animal_apis") -> None:
+    """
+    Write out all queued records and give the logger its handlers back.
+
+    Args:
+        name (str): Logger name
+    """
+    if name not in _listeners:
+        return
+
+    listener, queue_handler, handlers = _listeners.pop(name)
+    listener.stop()
+    queue_handler.queue.close()
+    queue_handler.queue.join_thread()
+
+    logger = logging.getLogger(name)
+    logger.removeHandler(queue_handler)
+    for handler in handlers:
+        logger.addHandler(handler)
+
+
+def get_listener_queue(name: str = "animal_apis") -> Optional[Any]:
+    """
+    Return the queue the logger's listener drains, or None if none is running.
+
+    Args:
+        name (str): Logger name
+    """
+    if name not in _listeners:
+        return None
+    _, queue_handler, _ = _listeners[name]
+    return queue_handler.queue
+
+
+def attach_to_listener(log_queue: Optional[Any], name: str = "animal_apis") -> None:
+    """
+    Send a worker process's log records to the parent's listener.
+
+    Used as a process pool initializer. Forked workers inherit the parent's
+    handlers, including records still buffered in its MemoryHandler; those
+    are dropped so they can't be written twice, and every record goes through
+    the queue so only the parent writes (and rotates) the log file. Without a
+    queue the worker keeps its own handlers.
+
+    Args:
+        log_queue: Queue returned by :func:`get_listener_queue` in the parent
+        name (str): Logger name
+    """
+    logger = logging.getLogger(name)
+    if name in _listeners:
+        # Inherited from the parent; the listener thread only runs there
+        _, queue_handler, handlers = _listeners.pop(name)
+        logger.removeHandler(queue_handler)
+        for handler in handlers:
+            logger.addHandler(handler)
+
+    for handler in logger.handlers:
+        if isinstance(handler, MemoryHandler):
+            # Records buffered before the fork are the parent's to write
+            handler.buffer.clear()
+
+    if log_queue is not None:
+        for handler in logger.handlers[:]:
+            logger.removeHandler(handler)
+        logger.addHandler(QueueHandler(log_queue))
+
 
 class CustomLogger:
     def __init__(self, name: str="animal_apis", log_file: str = "app.log", level: int = logging.INFO):
         """
         Initialize a custom logger.
-        
+
+        Thin wrapper around the cached :func:`get_logger` factory.
+
         Args:
             name (str): Logger name
             log_file (str): Path to log file
             level (int): Logging level
         """
-        self.logger = logging.getLogger(name)
-        self.logger.setLevel(level)
-
-        # Avoid duplicate handlers if logger is created multiple times
-        if not self.logger.handlers:
-            # Console handler
-            console_handler = logging.StreamHandler()
-            console_handler.setLevel(level)
-
-            # File handler with rotation
-            file_handler = RotatingFileHandler(log_file, maxBytes=5_000_000, backupCount=5)
-            file_handler.setLevel(level)
-
-            # Formatter
-            formatter = logging.Formatter(
-                "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-            )
-            console_handler.setFormatter(formatter)
-            file_handler.setFormatter(formatter)
-
-            # Add handlers
-            self.logger.addHandler(console_handler)
-            self.logger.addHandler(file_handler)
+        self.logger = get_logger(name, log_file, level)
 
     def get_logger(self):
         """Return the configured logger."""
@@ -42,10 +179,10 @@ class CustomLogger:
 
 # ---------------- Example Usage ----------------
 if __name__ == "__main__":
-    logger = CustomLogger("MyAppLogger", "myapp.log", logging.DEBUG).get_logger()
-    
+    logger = get_logger("MyAppLogger", "myapp.log", logging.DEBUG)
+
     logger.debug("This is a debug message.")
     logger.info("This is an info message.")
     logger.warning("This is a warning message.")
     logger.error("This is an error message.")
-    logger.critical("This is a critical message.")
\ No newline at end of file
+    logger.critical("This is a critical message.")
@@ -1,9 +1,38 @@
 from typing import List, Optional, Dict, Any, Union
+from dataclasses import dataclass, field
 from datetime import datetime
 from pydantic import BaseModel, Field, validator
-from Common.logger import CustomLogger
+from Common.logger import get_logger
 
-logger = CustomLogger().get_logger()
+logger = get_logger()
+
+
+@dataclass(slots=True)
+class AnimalRaw:
+    """
+    Compact, slotted record for animal details as returned by the API.
+
+    Used to carry fetched animals through the pipeline queues with less
+    memory than a dict per record. Any other fields the API returns are
+    kept in ``extra`` and passed through unchanged.
+    """
+    id: int
+    name: str
+    friends: Union[str, List[str], None] = None
+    born_at: Optional[Union[str, datetime]] = None
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'AnimalRaw':
+        extra_keys = data.keys() - _ANIMAL_RAW_FIELDS
+        extra = {key: data[key] for key in extra_keys} if extra_keys else {}
+        return cls(data.get('id'), data.get('name'), data.get('friends'), data.get('born_at'), extra)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'id': self.id, 'name': self.name, 'friends': self.friends, 'born_at': self.born_at, **self.extra}
+
+
+_ANIMAL_RAW_FIELDS = frozenset(('id', 'name', 'friends', 'born_at'))
 
 
 class Animal(BaseModel):
@@ -46,16 +75,21 @@ class Animal(BaseModel):
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Animal':
         try:
-            return cls(**data)
+            # Validate the dict directly rather than unpacking it into keyword arguments
+            return cls.model_validate(data)
         except Exception as e:
             logger.error(f"Error creating Animal from data {data}: {e}")
             raise
-    
+
     def to_dict(self) -> Dict[str, Any]:
-        return self.model_dump(
-            exclude_none=False,  # Include None values
-            by_alias=True,       # Use field aliases if defined
-        )
+        # No aliases are declared, so build the dict directly instead of model_dump
+        return {
+            'id': self.id,
+            'name': self.name,
+            'friends': self.friends,
+            'born_at': self.born_at,
+            **(self.__pydantic_extra__ or {}),
+        }
 
     
     def __str__(self) -> str:
@@ -1,18 +1,36 @@
-from typing import List, Dict, Any, Optional
-from datetime import datetime
-from dateutil import tz
+import re
+from typing import List, Dict, Any, Optional, Iterable, Iterator
+from datetime import datetime, timezone
+from itertools import islice
+
+_UTC = timezone.utc
+
+# Matches one comma-separated item without its surrounding whitespace;
+# empty and blank items never match, so no strip or filter pass is needed
+_CSV_ITEM = re.compile(r'[^,\s][^,]*[^,\s]|[^,\s]')
+
+
 def normalize_csv_string(csv_string: str) -> List[str]:
-    if not csv_string or not csv_string.strip():
+    if not csv_string:
         return []
     
-    return [item.strip() for item in csv_string.split(',') if item.strip()]
+    return _CSV_ITEM.findall(csv_string)
 
 
 def format_datetime_iso8601(dt: datetime) -> str:
-    # Ensure datetime is in UTC
-    if dt.tzinfo is None:
-        utc_dt = dt.replace(tzinfo=tz.UTC)
-    else:
-        utc_dt = dt.astimezone(tz.UTC)
+    # Ensure datetime is in UTC. Naive values are taken as UTC; since only the
+    # fields are formatted, naive and UTC values need no conversion at all
+    tzinfo = dt.tzinfo
+    utc_dt = dt if tzinfo is None or tzinfo is _UTC else dt.astimezone(_UTC)
     
-    return utc_dt.strftime('%Y-%m-%dT%H:%M:%SZ')
\ No newline at end of file
+    # Formatting the fields directly is faster than isoformat + replace or strftime
+    return '%04d-%02d-%02dT%02d:%02d:%02dZ' % (
+        utc_dt.year, utc_dt.month, utc_dt.day, utc_dt.hour, utc_dt.minute, utc_dt.second
+    )
+
+
+def chunked(iterable: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    # Stream fixed-size batches without slicing (works for generators too)
+    it = iter(iterable)
+    while batch := list(islice(it, size)):
+        yield batch
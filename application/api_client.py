@@ -1,24 +1,66 @@
 import asyncio
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator
 import aiohttp
 import json
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import random
-from Common.logger import CustomLogger
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
+from Common.logger import get_logger
 from Common.configs import EnvConfig
 
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # ijson is only needed for streaming list pages
+    ijson = None
+
+try:
+    import httpx
+    import h2  # noqa: F401 -- httpx needs it for http2=True
+except ImportError:  # httpx[http2] is only needed for the optional HTTP/2 load path
+    httpx = None
+
 env_config = EnvConfig()
-logger = CustomLogger().get_logger()
+logger = get_logger()
+
+# Prefer orjson for (de)serialization, fall back to the stdlib json module
+if orjson is not None:
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+    _json_dumps_bytes = orjson.dumps
+    _json_loads = orjson.loads
+else:
+    def _json_dumps_bytes(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+    _json_dumps = json.dumps
+    _json_loads = json.loads
 
 
 @dataclass
 class RetryConfig:
     """Configuration for retry behavior."""
-    max_attempts: int = int(env_config.get("MAX_ATTEMPTS",5))
-    base_delay: float = int(env_config.get("BASE_DELAY", 1))
-    max_delay: float = float(env_config.get("MAX_DELAY", 60))
-    backoff_factor: float = int(env_config.get("BACKOFF_FACTOR", 2))  # 2.0
+    max_attempts: int = field(default_factory=lambda: int(env_config.get("MAX_ATTEMPTS", 5)))
+    base_delay: float = field(default_factory=lambda: float(env_config.get("BASE_DELAY", 1)))
+    max_delay: float = field(default_factory=lambda: float(env_config.get("MAX_DELAY", 60)))
+    backoff_factor: float = field(default_factory=lambda: float(env_config.get("BACKOFF_FACTOR", 2)))
     jitter: bool = True
+    delays: List[float] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        """Precompute the capped exponential backoff delay before each retry."""
+        self.delays = [
+            min(self.base_delay * (self.backoff_factor ** i), self.max_delay)
+            for i in range(self.max_attempts - 1)
+        ]
+
+
+# Shared default so clients don't re-read the environment on every instantiation
+_DEFAULT_RETRY = RetryConfig()
 
 
 class AnimalAPIClient:
@@ -39,6 +81,9 @@ class AnimalAPIClient:
             backoff, and jitter.
         session (Optional[aiohttp.ClientSession]): Active aiohttp session
             used for making requests.
+        use_http2 (bool): Send batch loads over a shared HTTP/2 httpx client
+            so concurrent POSTs are multiplexed on one connection.
+        connection_limit (int): Maximum number of pooled connections to the API.
 
     Class Attributes:
         RETRY_STATUS_CODES (set[int]): HTTP status codes that should trigger
@@ -75,11 +120,25 @@ class AnimalAPIClient:
     """
     # HTTP status codes that should trigger retries
     RETRY_STATUS_CODES = {500, 502, 503, 504}
+    # Maximum number of animals accepted by the home endpoint per request
+    MAX_LOAD_BATCH_SIZE = 100
     
-    def __init__(self, base_url: str, retry_config: Optional[RetryConfig] = None):
+    def __init__(
+        self,
+        base_url: str,
+        retry_config: Optional[RetryConfig] = None,
+        use_http2: bool = False,
+        connection_limit: int = 1000
+    ):
         self.base_url = base_url.rstrip('/')
-        self.retry_config = retry_config or RetryConfig()
+        self.connection_limit = connection_limit
+        self.retry_config = retry_config or _DEFAULT_RETRY
         self.session: Optional[aiohttp.ClientSession] = None
+        self.http2_client = None
+        self.use_http2 = use_http2
+        if use_http2 and httpx is None:
+            logger.warning("httpx[http2] is not installed, loading over HTTP/1.1 instead of HTTP/2")
+            self.use_http2 = False
         
     async def __aenter__(self):
         """Async context manager entry."""
@@ -94,25 +153,85 @@ class AnimalAPIClient:
         """Ensure aiohttp session is created."""
         if self.session is None or self.session.closed:
             timeout = aiohttp.ClientTimeout(total=30)
-            connector = aiohttp.TCPConnector(limit=100, limit_per_host=20)
+            # All requests go to a single host, so the per-host cap is the pool size
+            connector = aiohttp.TCPConnector(
+                limit=self.connection_limit,
+                limit_per_host=self.connection_limit,
+                ttl_dns_cache=300,
+                enable_cleanup_closed=True,
+                keepalive_timeout=75
+            )
             self.session = aiohttp.ClientSession(
                 timeout=timeout,
                 connector=connector,
-                headers={'Content-Type': 'application/json'}
+                headers={
+                    'Content-Type': 'application/json',
+                    'Accept-Encoding': 'gzip, deflate',
+                    'Connection': 'keep-alive'
+                },
+                json_serialize=_json_dumps
+            )
+            
+    def _ensure_http2_client(self):
+        """Ensure the HTTP/2 httpx client is created."""
+        if self.http2_client is None or self.http2_client.is_closed:
+            self.http2_client = httpx.AsyncClient(
+                http2=True,
+                timeout=30,
+                limits=httpx.Limits(max_connections=1000, max_keepalive_connections=100)
             )
             
     async def close(self):
         """Close the HTTP session."""
         if self.session and not self.session.closed:
             await self.session.close()
+        if self.http2_client is not None and not self.http2_client.is_closed:
+            await self.http2_client.aclose()
             
-    async def _request_with_retry(self, method: str, url: str, **kwargs) -> Dict[str, Any]:
+    async def _http2_request(self, method: str, url: str, **kwargs) -> Dict[str, Any]:
+        """
+        Make a single HTTP request through the HTTP/2 client.
+        
+        Args:
+            method: HTTP method (GET, POST, etc.)
+            url: Request URL
+            **kwargs: aiohttp-style request arguments (data, headers, params)
+            
+        Returns:
+            Parsed JSON response
+            
+        Raises:
+            aiohttp.ClientResponseError: If the response status is not 200
+        """
+        self._ensure_http2_client()
+        response = await self.http2_client.request(
+            method,
+            url,
+            content=kwargs.get('data'),
+            headers=kwargs.get('headers'),
+            params=kwargs.get('params')
+        )
+        logger.debug("Response status: %s (%s)", response.status_code, response.http_version)
+        if response.status_code != 200:
+            # Same error as the aiohttp path, so callers can act on the status
+            request_url = URL(str(response.request.url))
+            request_headers = CIMultiDictProxy(CIMultiDict(response.request.headers))
+            raise aiohttp.ClientResponseError(
+                request_info=aiohttp.RequestInfo(request_url, method, request_headers, request_url),
+                history=(),
+                status=response.status_code,
+                message=f"HTTP/2 request failed with status {response.status_code}: {response.text}"
+            )
+        return _json_loads(response.content)
+            
+    async def _request_with_retry(self, method: str, url: str, http2: bool = False, **kwargs) -> Dict[str, Any]:
         """
         Make HTTP request with exponential backoff retry logic.
         
         Args:
             method: HTTP method (GET, POST, etc.)
             url: Request URL
+            http2: Send the request through the HTTP/2 client
             **kwargs: Additional arguments for aiohttp request
             
         Returns:
@@ -127,17 +246,20 @@ class AnimalAPIClient:
         
         for attempt in range(1, self.retry_config.max_attempts + 1):
             try:
-                logger.debug(f"Attempt {attempt}/{self.retry_config.max_attempts}: {method} {url}")
+                logger.debug("Attempt %d/%d: %s %s", attempt, self.retry_config.max_attempts, method, url)
+                
+                if http2:
+                    return await self._http2_request(method, url, **kwargs)
                 
                 async with self.session.request(method, url, **kwargs) as response:
                     # Log the response status
-                    logger.debug(f"Response status: {response.status}")
+                    logger.debug("Response status: %s", response.status)
                     
                     # Handle successful responses
                     if response.status == 200:
                         try:
-                            data = await response.json()
-                            logger.debug(f"Successful response on attempt {attempt}")
+                            data = await response.json(loads=_json_loads)
+                            logger.debug("Successful response on attempt %d", attempt)
                             return data
                         except (aiohttp.ContentTypeError, json.JSONDecodeError) as e:
                             logger.error(f"Failed to parse JSON response: {e}")
@@ -184,14 +306,11 @@ class AnimalAPIClient:
                 
             # Calculate delay before next retry
             if attempt < self.retry_config.max_attempts:
-                delay = min(
-                    self.retry_config.base_delay * (self.retry_config.backoff_factor ** (attempt - 1)),
-                    self.retry_config.max_delay
-                )
+                delay = self.retry_config.delays[attempt - 1]
                 
-                # Add jitter to prevent thundering herd
+                # Add "full jitter" to prevent thundering herd: sleep anywhere in [0, delay]
                 if self.retry_config.jitter:
-                    delay *= (0.5 + random.random() * 0.5)
+                    delay = random.uniform(0, delay)
                     
                 logger.info(f"Waiting {delay:.2f}s before retry...")
                 await asyncio.sleep(delay)
@@ -220,6 +339,43 @@ class AnimalAPIClient:
         logger.info(f"Fetching animals list - page {page}")
         return await self._request_with_retry('GET', url, params=params)
     
+    async def iter_animals(self, page: int = 1, per_page: int = 50) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream the animals of a list page as they are decoded off the socket.
+
+        Keeps memory flat for large pages by never materializing the whole
+        response. Falls back to :meth:`list_animals` (with retries) when ijson
+        is not installed or the streamed request does not succeed.
+        
+        Args:
+            page: Page number (1-based)
+            per_page: Number of items per page
+            
+        Yields:
+            Animal summaries from the page
+        """
+        if ijson is None:
+            response = await self.list_animals(page=page, per_page=per_page)
+            for animal in response.get('items', []):
+                yield animal
+            return
+
+        await self._ensure_session()
+        url = f"{self.base_url}/animals/v1/animals"
+        params = {'page': page, 'per_page': per_page}
+        
+        logger.info(f"Streaming animals list - page {page}")
+        async with self.session.get(url, params=params) as response:
+            if response.status == 200:
+                async for animal in ijson.items_async(response.content, 'items.item', use_float=True):
+                    yield animal
+                return
+            logger.warning(f"Streaming page {page} returned status {response.status}, retrying without streaming")
+
+        response = await self.list_animals(page=page, per_page=per_page)
+        for animal in response.get('items', []):
+            yield animal
+    
     async def get_animal_details(self, animal_id: str) -> Dict[str, Any]:
         """
         Get detailed information for a specific animal.
@@ -232,7 +388,7 @@ class AnimalAPIClient:
         """
         url = f"{self.base_url}/animals/v1/animals/{animal_id}"
         
-        logger.debug(f"Fetching details for animal {animal_id}")
+        logger.debug("Fetching details for animal %s", animal_id)
         return await self._request_with_retry('GET', url)
     
     async def load_animals_home(self, animals: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -248,16 +404,21 @@ class AnimalAPIClient:
         Raises:
             ValueError: If animals list exceeds 100 items
         """
-        if len(animals) > 100:
-            raise ValueError(f"Cannot load more than 100 animals at once. Got {len(animals)}")
+        if len(animals) > self.MAX_LOAD_BATCH_SIZE:
+            raise ValueError(
+                f"Cannot load more than {self.MAX_LOAD_BATCH_SIZE} animals at once. Got {len(animals)}"
+            )
             
         url = f"{self.base_url}/animals/v1/home"
         
         logger.info(f"Loading {len(animals)} animals to home endpoint")
+        # Encode the body once, straight to bytes; retries reuse the same payload
+        body = _json_dumps_bytes(animals)
         return await self._request_with_retry(
             'POST', 
             url, 
-            json=animals,
+            http2=self.use_http2,
+            data=body,
             headers={'Content-Type': 'application/json'}
         )
     
@@ -1,216 +1,537 @@
 import asyncio
-from typing import List, Dict, Any, Optional
+import itertools
+import os
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
+from typing import List, Dict, Any, Optional, AsyncIterator, Deque, Sequence, Tuple
 from datetime import datetime
 import json
 
+import aiohttp
+from pydantic import ValidationError
+
 from application.api_client import AnimalAPIClient
 from application.transformer import AnimalTransformer
-from Common.models import Animal
-from Common.logger import CustomLogger
+from Common.models import Animal, AnimalRaw
+from Common.utils import chunked
+from Common.logger import attach_to_listener, get_listener_queue, get_logger, start_queue_listener, stop_queue_listener
 from Common.configs import EnvConfig
 
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup
+    orjson = None
+
+try:
+    import uvloop
+except ImportError:  # uvloop is an optional speedup (not available on Windows)
+    uvloop = None
+
+try:
+    import ijson
+except ImportError:  # ijson is only needed for streaming list pages
+    ijson = None
+
 env_config = EnvConfig()
 
+if orjson is not None:
+    _dumps = orjson.dumps
+else:
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+_get_id = itemgetter('id')
+
+# Errors that can cut a streamed list page short (dropped connection, timeout, truncated body)
+_PAGE_STREAM_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError) + ((ijson.JSONError,) if ijson is not None else ())
+
+# With use_dataframe, chunks at least this large are transformed column-wise with pandas
+DATAFRAME_THRESHOLD = 256
+
+
+def _validate_chunk(animals: List[AnimalRaw]) -> List[Dict[str, Any]]:
+    """
+    Return the chunk's records as dicts, dropping those that aren't valid animals.
+
+    Records with an int id and a str name are taken as-is; any other record
+    goes through the Animal model, which coerces it (e.g. a numeric string id)
+    or rejects it. Rejected records are logged and skipped.
+    """
+    records = []
+    for raw_animal in animals:
+        record = raw_animal.to_dict()
+        if type(record['id']) is not int or type(record['name']) is not str:
+            try:
+                animal = Animal.model_validate(record)
+            except ValidationError as e:
+                get_logger().error(f"Skipping invalid animal {record['id']!r}: {e}")
+                continue
+            record['id'] = animal.id
+            record['name'] = animal.name
+        records.append(record)
+    return records
+
+
+def _transform_chunk(animals: List[AnimalRaw], use_dataframe: bool = False) -> List[Dict[str, Any]]:
+    """
+    Validate and transform a chunk of raw animal records into the required output format.
+
+    Defined at module level so it can be pickled and run in a worker process.
+    """
+    logger = get_logger()
+    records = _validate_chunk(animals)
+    transformer = AnimalTransformer()
+    if use_dataframe and len(records) >= DATAFRAME_THRESHOLD:
+        return transformer.transform_batch_df(records)
+
+    transformed = []
+    for record in records:
+        try:
+            transformed.append(transformer.transform_raw(record))
+        except Exception as e:
+            logger.error(f"Error transforming animal {record['id']}: {e}")
+            continue
+    return transformed
+
 
 class AnimalETLPipeline:
-    """Main ETL pipeline orchestrator."""
+    """
+    Main ETL pipeline orchestrator.
+
+    All stages run as tasks on a single event loop, and stats are only
+    updated in synchronous code between awaits, so they need no locking.
+    """
     
-    def __init__(self, base_url: str = "http://localhost:3123", batch_size: int = 100, concurrency: int = 5):
+    # Seconds the loader waits for new records before flushing a partial batch
+    LOAD_FLUSH_TIMEOUT = 1.0
+    # Number of animals sent to a worker process per transform task
+    TRANSFORM_CHUNK_SIZE = 1000
+    # Batches smaller than this are transformed inline; IPC would cost more
+    PROCESS_POOL_THRESHOLD = 32
+    # Number of list pages the producer keeps in flight
+    PAGE_PREFETCH = 2
+    # Home endpoint statuses that make the loader stop sending shards in parallel
+    LOAD_FALLBACK_STATUS_CODES = {413, 429}
+    # Number of recently fetched animal details kept to answer repeated IDs
+    DETAIL_CACHE_SIZE = 10_000
+    
+    def __init__(
+        self,
+        base_url: str = "http://localhost:3123",
+        batch_size: int = 100,
+        concurrency: int = 5,
+        detail_concurrency: int = 64,
+        use_http2: bool = False,
+        use_dataframe: bool = False,
+        parallel_load: bool = True
+    ):
         """
         Initialize the AnimalETLPipeline.
         
         Args:
             base_url (str): Animals API base URL.
             batch_size (int): Number of animals to process in each batch.
-            concurrency (int): Number of concurrent ETL workers.
+            concurrency (int): Number of concurrent detail-fetch workers.
+            detail_concurrency (int): Maximum in-flight detail requests across all workers.
+            use_http2 (bool): Load batches over HTTP/2 (requires httpx[http2]).
+            use_dataframe (bool): Transform large chunks with pandas (requires pandas).
+            parallel_load (bool): Load each batch as ``concurrency`` parallel requests.
         """
-        self.logger = CustomLogger().get_logger()
-        self.api_client = AnimalAPIClient(base_url)
-        self.transformer = AnimalTransformer()
+        self.logger = get_logger()
+        # Size the connection pool to the in-flight detail requests, plus the
+        # producer's prefetched pages and the loader's parallel shards
+        self.api_client = AnimalAPIClient(
+            base_url,
+            use_http2=use_http2,
+            connection_limit=detail_concurrency + self.PAGE_PREFETCH + concurrency
+        )
         self.batch_size = batch_size
         self.concurrency = concurrency
-        self.stats_lock = asyncio.Lock()
+        self.detail_concurrency = detail_concurrency
+        self.use_dataframe = use_dataframe
+        self.parallel_load = parallel_load
+        self._detail_semaphore = asyncio.Semaphore(detail_concurrency)
+        # Detail requests in flight and recent results, keyed by animal ID
+        self._inflight: Dict[int, asyncio.Future] = {}
+        self._details: OrderedDict[int, Dict[str, Any]] = OrderedDict()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # Numbers the pages of IDs picked up by the workers, for logging
+        self._batch_counter = itertools.count(1)
 
     async def run_pipeline(self) -> Dict[str, Any]:
         """
-        Execute the ETL pipeline by processing data in concurrent batches.
+        Execute the ETL pipeline as three concurrent, streaming stages.
 
-        This method implements a concurrent producer-consumer pattern:
-        1. **Producer**: Fetches pages of animal summaries and puts their IDs into a queue.
-        2. **Consumers (Workers)**: Concurrently pull batches of IDs from the queue
-           and perform the full ETL process (fetch details, transform, load) for each batch.
+        The stages are connected by bounded queues so that loading starts as
+        soon as the first details arrive and memory stays proportional to the
+        queue sizes rather than the total number of animals:
+        1. **Producer**: Fetches pages of animal summaries and puts their IDs into the ID queue.
+        2. **Consumers (Workers)**: Concurrently pull pages of IDs, fetch the animal
+           details and put each one into the detail queue as soon as it arrives.
+        3. **Loader**: Drains the detail queue, transforms the animals and loads them
+           in batches of ``batch_size``, flushing a partial batch when no new records
+           arrive within ``LOAD_FLUSH_TIMEOUT`` seconds.
 
         Returns:
             Dict[str, Any]: A dictionary with statistics about the pipeline execution.
         """
-        self.logger.info(f"Starting Animal ETL Pipeline with {self.concurrency} concurrent workers")
-        start_time = datetime.now()
-        stats = {
-            'start_time': start_time.isoformat(),
-            'animals_fetched': 0,
-            'animals_transformed': 0,
-            'animals_loaded': 0,
-            'batches_processed': 0,
-            'errors': []
-        }
-
-        queue = asyncio.Queue(maxsize=self.concurrency * 2)
-
-        # Start the producer and consumer tasks
-        producer = asyncio.create_task(self._produce_animal_ids(queue))
-        consumers = [
-            asyncio.create_task(self._consume_and_process(queue, stats))
-            for _ in range(self.concurrency)
-        ]
-
-        # Wait for the producer to finish
-        await producer
-
-        # Wait for the consumers to finish processing all items in the queue
-        await queue.join()
-
-        # Cancel the consumer tasks
-        for consumer in consumers:
-            consumer.cancel()
-        
-        # Wait for consumer cancellation to complete
-        await asyncio.gather(*consumers, return_exceptions=True)
+        # Format and write log records on a background thread, off the event loop
+        start_queue_listener()
+        try:
+            self.logger.info(f"Starting Animal ETL Pipeline with {self.concurrency} concurrent workers")
+            start = time.perf_counter()
+            stats = {
+                'start_time': datetime.now().isoformat(),
+                'animals_fetched': 0,
+                'animals_transformed': 0,
+                'animals_loaded': 0,
+                'batches_processed': 0,
+                'errors': []
+            }
+
+            # One shared session (and connection pool) for the whole run
+            async with self.api_client:
+                await self._run_stages(stats)
 
-        end_time = datetime.now()
-        duration = end_time - start_time
-        stats['end_time'] = end_time.isoformat()
-        stats['duration_seconds'] = duration.total_seconds()
-        await self.api_client.close()
+            duration_seconds = time.perf_counter() - start
+            stats['end_time'] = datetime.now().isoformat()
+            stats['duration_seconds'] = duration_seconds
 
-        self.logger.info(f"Pipeline completed in {duration.total_seconds():.2f} seconds")
-        self.logger.info(f"Final stats: {json.dumps(stats, indent=2)}")
+            self.logger.info(f"Pipeline completed in {duration_seconds:.2f} seconds")
+            self.logger.info(f"Final stats: {_dumps(stats).decode()}")
 
-        return stats
+            return stats
+        finally:
+            # Workers exit first, so their queued records reach the listener before it stops
+            self._shutdown_pool()
+            stop_queue_listener()
 
-    async def _produce_animal_ids(self, queue: asyncio.Queue):
+    async def _run_stages(self, stats: Dict[str, Any]):
+        """
+        Run the producer, consumer and loader stages until all animals are loaded.
+        """
+        id_queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        detail_queue = asyncio.Queue(maxsize=self.batch_size * 4)
+
+        async def produce():
+            await self._produce_animal_ids(id_queue, stats)
+            # One sentinel per worker: no more pages will be queued
+            for _ in range(self.concurrency):
+                await id_queue.put(None)
+
+        async with asyncio.TaskGroup() as stages:
+            stages.create_task(self._load_animals(detail_queue, stats))
+
+            # The inner group exits once the producer and every worker are done
+            async with asyncio.TaskGroup() as fetchers:
+                fetchers.create_task(produce())
+                for _ in range(self.concurrency):
+                    fetchers.create_task(self._consume_and_process(id_queue, detail_queue, stats))
+
+            # Signal the loader that no more details will arrive and let it flush
+            await detail_queue.put(None)
+
+    async def _fetch_page_ids(self, page: int) -> Tuple[int, ...]:
+        """
+        Stream a page of animal summaries, keeping only their IDs.
+
+        Returned as a tuple: it is queued as-is and never modified, and a
+        tuple is smaller than the equivalent list. If the stream breaks off,
+        the IDs read so far are dropped and the page is fetched again in one
+        request (with retries).
+        """
+        try:
+            animals = self.api_client.iter_animals(page=page, per_page=self.batch_size)
+            return tuple([_get_id(animal) async for animal in animals])
+        except _PAGE_STREAM_ERRORS as e:
+            self.logger.warning(f"Streaming page {page} failed ({type(e).__name__}: {e}), re-fetching it without streaming")
+            response = await self.api_client.list_animals(page=page, per_page=self.batch_size)
+            return tuple([_get_id(animal) for animal in response.get('items', [])])
+
+    def _request_page(self, page: int) -> asyncio.Task:
+        """Start fetching the animal IDs of a page in the background."""
+        self.logger.info(f"Fetching animal list page {page}...")
+        return asyncio.create_task(self._fetch_page_ids(page))
+
+    async def _produce_animal_ids(self, queue: asyncio.Queue, stats: Dict[str, Any]):
         """
         Producer: Fetches animal IDs page by page and puts them into the queue.
+
+        Up to ``PAGE_PREFETCH`` pages are requested ahead, so list round-trips
+        overlap with queueing (and waiting on) earlier pages. Pages are still
+        queued in order, and production stops at the first empty page.
         """
-        page = 1
-        while True:
-            try:
-                self.logger.info(f"Fetching animal list page {page}...")
-                response = await self.api_client.list_animals(page=page, per_page=self.batch_size)
-                animal_summaries = response.get('items', [])
+        next_page = 1
+        pending: Deque[Tuple[int, asyncio.Task]] = deque()
 
-                if not animal_summaries:
-                    self.logger.info("Producer: No more animals to process.")
-                    break
+        def request_next_page():
+            nonlocal next_page
+            pending.append((next_page, self._request_page(next_page)))
+            next_page += 1
 
-                animal_ids = [animal['id'] for animal in animal_summaries]
-                await queue.put(animal_ids)
-                self.logger.info(f"Producer: Queued batch of {len(animal_ids)} animals from page {page}.")
-                page += 1
-            except Exception as e:
-                self.logger.error(f"Producer failed on page {page}: {e}")
-                break
+        for _ in range(self.PAGE_PREFETCH):
+            request_next_page()
+
+        try:
+            while pending:
+                page, page_task = pending.popleft()
+                try:
+                    animal_ids = await page_task
+
+                    if not animal_ids:
+                        self.logger.info("Producer: No more animals to process.")
+                        break
 
-    async def _consume_and_process(self, queue: asyncio.Queue, stats: Dict[str, Any]):
+                    # Keep the look-ahead window full while this page is queued
+                    request_next_page()
+
+                    await queue.put(animal_ids)
+                    self.logger.info(f"Producer: Queued batch of {len(animal_ids)} animals from page {page}.")
+                except Exception as e:
+                    self.logger.error(f"Producer failed on page {page}: {e}")
+                    stats['errors'].append(f"Producer failed on page {page}: {e}")
+                    break
+        finally:
+            # Don't leave prefetches running once the producer stops
+            for _, page_task in pending:
+                page_task.cancel()
+            await asyncio.gather(*(page_task for _, page_task in pending), return_exceptions=True)
+
+    async def _consume_and_process(self, queue: asyncio.Queue, detail_queue: asyncio.Queue, stats: Dict[str, Any]):
         """
-        Consumer: Continuously takes batches of animal IDs from the queue and processes them.
+        Consumer: Continuously takes batches of animal IDs from the queue, fetches
+        their details and hands them over to the loader via the detail queue.
         """
         while True:
+            animal_ids = await queue.get()
+            if animal_ids is None:
+                break
+
             try:
-                animal_ids = await queue.get()
-                batch_num = stats['batches_processed'] + 1
-                self.logger.info(f"Worker starting to process batch {batch_num}...")
+                batch_num = next(self._batch_counter)
+                self.logger.info(f"Worker starting to fetch batch {batch_num}...")
                 
-                await self._process_batch(animal_ids, stats)
+                # Hand each animal to the loader as soon as its details arrive
+                fetched = 0
+                async for animal in self._iter_animal_details(animal_ids):
+                    await detail_queue.put(animal)
+                    fetched += 1
+                stats['animals_fetched'] += fetched
                 
-                queue.task_done()
-                self.logger.info(f"Worker finished processing batch {batch_num}.")
-            except asyncio.CancelledError:
-                self.logger.info("Worker task was cancelled.")
-                break
+                self.logger.info(f"Worker finished fetching batch {batch_num}.")
             except Exception as e:
                 self.logger.error(f"Consumer worker failed: {e}")
-                async with self.stats_lock:
-                    stats['errors'].append(str(e))
-                queue.task_done()
+                stats['errors'].append(str(e))
 
+    async def _load_animals(self, detail_queue: asyncio.Queue, stats: Dict[str, Any]):
+        """
+        Loader: Buffers fetched animal details and processes them in batches.
 
-    async def _process_batch(self, animal_ids: List[str], stats: Dict[str, Any]):
+        A batch is processed when it reaches ``batch_size`` or when no new
+        details arrive within ``LOAD_FLUSH_TIMEOUT`` seconds. A ``None`` item
+        in the queue marks the end of the stream.
         """
-        Processes a single batch of animals: fetch details, transform, and load.
+        buffer: List[AnimalRaw] = []
+        while True:
+            try:
+                animal_data = await asyncio.wait_for(detail_queue.get(), timeout=self.LOAD_FLUSH_TIMEOUT)
+            except asyncio.TimeoutError:
+                if buffer:
+                    await self._process_batch(buffer, stats)
+                    buffer = []
+                continue
+
+            if animal_data is None:
+                break
+
+            buffer.append(animal_data)
+            if len(buffer) >= self.batch_size:
+                await self._process_batch(buffer, stats)
+                buffer = []
+
+        if buffer:
+            await self._process_batch(buffer, stats)
+
+    async def _process_batch(self, detailed_animals: List[AnimalRaw], stats: Dict[str, Any]):
+        """
+        Processes a single batch of fetched animals: transform and load.
         """
         try:
-            # Step 1: Extract details for the current batch
-            detailed_animals = await self._fetch_animal_details(animal_ids)
-            
-            # Step 2: Transform the current batch
-            transformed_animals = self._transform_animals(detailed_animals)
+            # Step 1: Transform the current batch
+            transformed_animals = await self._transform_animals(detailed_animals)
             
-            # Step 3: Load the current batch
-            if transformed_animals:
-                await self._load_batch(transformed_animals)
+            # Step 2: Load the current batch; failed requests are recorded in stats['errors']
+            loaded = await self._load_batch(transformed_animals, stats) if transformed_animals else 0
             
-            # Update stats safely
-            async with self.stats_lock:
-                stats['animals_fetched'] += len(detailed_animals)
-                stats['animals_transformed'] += len(transformed_animals)
-                stats['animals_loaded'] += len(transformed_animals)
+            # Update stats (no await in between, so no other task can interleave)
+            stats['animals_transformed'] += len(transformed_animals)
+            stats['animals_loaded'] += loaded
+            if loaded == len(transformed_animals):
                 stats['batches_processed'] += 1
 
         except Exception as e:
-            self.logger.error(f"Failed to process a batch of {len(animal_ids)} animals: {e}")
-            async with self.stats_lock:
-                stats['errors'].append(f"Batch processing failed: {e}")
+            self.logger.error(f"Failed to process a batch of {len(detailed_animals)} animals: {e}")
+            stats['errors'].append(f"Batch processing failed: {e}")
 
-    async def _fetch_animal_details(self, animal_ids: List[str]) -> List[Dict[str, Any]]:
+    async def _iter_animal_details(self, animal_ids: Sequence[int]) -> AsyncIterator[AnimalRaw]:
         """
-        Fetch detailed information for a batch of animals given their IDs.
+        Fetch detailed information for a batch of animals given their IDs,
+        yielding each animal as soon as its request completes.
+
+        IDs seen again, in this batch or a later one, share the request in
+        flight or reuse one of the last ``DETAIL_CACHE_SIZE`` results.
         """
-        animals = []
-        semaphore = asyncio.Semaphore(10) # Limit concurrency for detail fetching within a batch
+        async def fetch_single_animal(animal_id: int) -> Optional[Dict[str, Any]]:
+            # Repeated IDs are answered from a recent result or the request already in flight
+            details = self._details.get(animal_id)
+            if details is not None:
+                self._details.move_to_end(animal_id)
+                return details
+            pending = self._inflight.get(animal_id)
+            if pending is not None:
+                # Shielded so a cancelled waiter doesn't cancel the shared result
+                return await asyncio.shield(pending)
 
-        async def fetch_single_animal(animal_id: str) -> Optional[Dict[str, Any]]:
-            async with semaphore:
-                try:
-                    return await self.api_client.get_animal_details(animal_id)
-                except Exception as e:
-                    self.logger.error(f"Failed to fetch details for animal {animal_id}: {e}")
-                    return None
-        
-        tasks = [fetch_single_animal(animal_id) for animal_id in animal_ids]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+            future = asyncio.get_running_loop().create_future()
+            self._inflight[animal_id] = future
+            try:
+                # Shared by all workers, so total in-flight requests stay bounded
+                async with self._detail_semaphore:
+                    try:
+                        details = await self.api_client.get_animal_details(animal_id)
+                    except Exception as e:
+                        self.logger.error(f"Failed to fetch details for animal {animal_id}: {e}")
+            finally:
+                del self._inflight[animal_id]
+                future.set_result(details)
+
+            if details is not None:
+                self._details[animal_id] = details
+                if len(self._details) > self.DETAIL_CACHE_SIZE:
+                    self._details.popitem(last=False)
+            return details
         
-        for result in results:
-            if isinstance(result, dict):
-                animals.append(result)
-            elif result is not None:
-                self.logger.error(f"Exception in fetch task: {result}")
-                
-        return animals
+        # fetch_single_animal handles its own errors, returning None on failure
+        tasks = [asyncio.create_task(fetch_single_animal(animal_id)) for animal_id in animal_ids]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                result = await next_result
+                if result is not None:
+                    yield AnimalRaw.from_dict(result)
+        finally:
+            # Don't leave requests running if the consumer stops early
+            for task in tasks:
+                task.cancel()
+    
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Ensure the transform process pool is created."""
+        if self._pool is None:
+            # Workers log through the listener's queue, so only this process writes the log file
+            self._pool = ProcessPoolExecutor(
+                max_workers=os.cpu_count(),
+                initializer=attach_to_listener,
+                initargs=(get_listener_queue(),)
+            )
+        return self._pool
+
+    def _shutdown_pool(self):
+        """Shut down the transform process pool."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    async def _transform_animals(self, animals: List[AnimalRaw]) -> List[Dict[str, Any]]:
+        """
+        Transform raw animal records into the required output format.
+
+        The CPU-bound work is offloaded to a process pool in chunks of
+        ``TRANSFORM_CHUNK_SIZE`` so it does not block the event loop. Batches
+        below ``PROCESS_POOL_THRESHOLD`` are transformed inline.
+        """
+        if len(animals) < self.PROCESS_POOL_THRESHOLD:
+            return _transform_chunk(animals, self.use_dataframe)
+
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool()
+        results = await asyncio.gather(*[
+            loop.run_in_executor(pool, _transform_chunk, chunk, self.use_dataframe)
+            for chunk in chunked(animals, self.TRANSFORM_CHUNK_SIZE)
+        ])
+        return [animal for chunk in results for animal in chunk]
     
-    def _transform_animals(self, animals: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    async def _load_batch(self, animals: List[Dict[str, Any]], stats: Dict[str, Any]) -> int:
         """
-        Transform raw animal data into the required output format.
+        Load a single batch of transformed animal data to the home endpoint,
+        splitting it into requests the endpoint accepts.
+
+        A failed request is logged and recorded in ``stats['errors']``.
+
+        Returns:
+            int: The number of animals the endpoint accepted.
         """
-        transformed = []
-        for animal_data in animals:
+        if self.parallel_load and len(animals) > 1:
+            return await self._load_shards(animals, stats)
+
+        loaded = 0
+        for chunk in chunked(animals, self.api_client.MAX_LOAD_BATCH_SIZE):
             try:
-                animal = Animal.from_dict(animal_data)
-                transformed_animal = self.transformer.transform(animal)
-                transformed.append(transformed_animal.to_dict())
+                await self.api_client.load_animals_home(chunk)
             except Exception as e:
-                self.logger.error(f"Error transforming animal {animal_data.get('id', 'unknown')}: {e}")
-                continue
-        return transformed
-    
-    async def _load_batch(self, animals: List[Dict[str, Any]]) -> None:
+                self._record_load_error(len(animals) - loaded, e, stats)
+                break
+            loaded += len(chunk)
+        return loaded
+
+    def _record_load_error(self, count: int, error: BaseException, stats: Dict[str, Any]):
+        """Log and record a failed home endpoint request."""
+        self.logger.error(f"Failed to load {count} animals: {error}")
+        stats['errors'].append(f"Load failed for {count} animals: {error}")
+
+    async def _load_shards(self, animals: List[Dict[str, Any]], stats: Dict[str, Any]) -> int:
         """
-        Load a single batch of transformed animal data to the home endpoint.
+        Load a batch as ``concurrency`` shards sent in parallel.
+
+        If the endpoint rejects shards as too large or too many (see
+        ``LOAD_FALLBACK_STATUS_CODES``), parallel loading is turned off for the
+        rest of the run and only the rejected shards are sent again, one at a time.
+
+        Returns:
+            int: The number of animals in the shards that were loaded.
         """
-        try:
-            await self.api_client.load_animals_home(animals)
-        except Exception as e:
-            self.logger.error(f"Failed to load a batch of {len(animals)} animals: {e}")
-            raise
+        # Round up, so a small batch is never split into more than ``concurrency`` shards
+        shard_size = min(self.api_client.MAX_LOAD_BATCH_SIZE, -(-len(animals) // self.concurrency))
+        shards = list(chunked(animals, shard_size))
+        results = await asyncio.gather(
+            *[self.api_client.load_animals_home(shard) for shard in shards],
+            return_exceptions=True
+        )
+
+        loaded = 0
+        rejected = []
+        for shard, result in zip(shards, results):
+            if isinstance(result, aiohttp.ClientResponseError) and result.status in self.LOAD_FALLBACK_STATUS_CODES:
+                rejected.append(shard)
+            elif isinstance(result, BaseException):
+                self._record_load_error(len(shard), result, stats)
+            else:
+                loaded += len(shard)
+
+        if rejected:
+            self.logger.warning(
+                f"Home endpoint rejected {len(rejected)} parallel shards, loading sequentially from now on"
+            )
+            self.parallel_load = False
+            for shard in rejected:
+                try:
+                    await self.api_client.load_animals_home(shard)
+                except Exception as e:
+                    self._record_load_error(len(shard), e, stats)
+                    continue
+                loaded += len(shard)
+
+        return loaded
 
 
 async def main():
@@ -220,7 +541,11 @@ async def main():
         pipeline = AnimalETLPipeline(
             env_config.get("BASE_URL", "http://localhost:3123"), 
             int(env_config.get("BATCH_SIZE", 100)),
-            int(env_config.get("CONCURRENCY", 5))
+            int(env_config.get("CONCURRENCY", 5)),
+            int(env_config.get("DETAIL_CONCURRENCY", 64)),
+            env_config.get("USE_HTTP2", "false").lower() == "true",
+            env_config.get("USE_DATAFRAME", "false").lower() == "true",
+            env_config.get("PARALLEL_LOAD", "true").lower() == "true"
         )
         stats = await pipeline.run_pipeline()
         
@@ -246,5 +571,7 @@ async def main():
 
 
 if __name__ == "__main__":
-    exit_code = asyncio.run(main())
+    # Run on uvloop's faster event loop when it is installed
+    run = uvloop.run if uvloop is not None else asyncio.run
+    exit_code = run(main())
     exit(exit_code)
@@ -1,14 +1,72 @@
-from typing import List, Optional, Union, Dict, Any
+import functools
+import logging
+import re
+import sys
+from typing import List, Optional, Union, Dict, Any, Tuple
 from datetime import datetime
 import dateutil.parser
-from dateutil import tz
+
+try:
+    from ciso8601 import parse_datetime as _parse_iso8601
+except ImportError:  # ciso8601 is an optional speedup over fromisoformat
+    _parse_iso8601 = datetime.fromisoformat
 
 from Common.models import Animal
+from Common.utils import format_datetime_iso8601, normalize_csv_string
+
+from Common.logger import get_logger
+
 
-from Common.logger import CustomLogger
+logger = get_logger()
 
+# Matches born_at strings already in the output format (YYYY-MM-DDTHH:MM:SSZ)
+_ISO_Z_RE = re.compile(r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z')
 
-logger = CustomLogger().get_logger()
+
+@functools.lru_cache(maxsize=4096)
+def _parse_friends_csv(friends: str) -> Tuple[str, ...]:
+    """
+    Split a friends CSV string into cleaned names.
+
+    Cached because feeds repeat the same friend lists; returns a tuple so the
+    cached value can't be mutated by callers. Names are interned, so each
+    distinct friend name is stored once however many lists it appears in.
+    """
+    return tuple(map(sys.intern, normalize_csv_string(friends)))
+
+
+def _intern(value: Any) -> Any:
+    """Intern plain strings (names repeat across animals); leave anything else as-is."""
+    return sys.intern(value) if type(value) is str else value
+
+
+@functools.lru_cache(maxsize=8192)
+def _parse_born_at(born_at: str) -> Optional[str]:
+    """
+    Parse a stripped, non-empty born_at string into a UTC ISO8601 string.
+
+    Cached because feeds repeat the same timestamps; returns None if the
+    string can't be parsed.
+    """
+    # Fast path: most API values are already ISO8601 (fromisoformat takes a 'Z' suffix since 3.11)
+    try:
+        parsed_dt = _parse_iso8601(born_at)
+    except ValueError:
+        parsed_dt = None
+    
+    # Always format from the parsed value: even a string that looks canonical
+    # may be normalised by the parser (ciso8601 takes hour 24 as next midnight)
+    try:
+        # Fall back to dateutil for non-ISO formats
+        if parsed_dt is None:
+            parsed_dt = dateutil.parser.parse(born_at)
+        
+        # Naive datetimes are taken as UTC
+        return format_datetime_iso8601(parsed_dt)
+        
+    except (ValueError, TypeError, OverflowError, dateutil.parser.ParserError) as e:
+        logger.error(f"Failed to parse born_at string '{born_at}': {e}")
+        return None
 
 
 class AnimalTransformer:
@@ -21,11 +79,10 @@ class AnimalTransformer:
     
     def __init__(self):
         """Initialize the transformer."""
-        self.stats = {
-            'friends_transformed': 0,
-            'born_at_transformed': 0,
-            'transformation_errors': 0
-        }
+        # Plain integer counters; get_stats builds the dict on demand
+        self._friends_n = 0
+        self._born_at_n = 0
+        self._errors_n = 0
     
     def transform(self, animal: Animal) -> Animal:
         """
@@ -33,8 +90,8 @@ class AnimalTransformer:
 
         This method takes an Animal object and applies transformations on the
         friends and born_at fields according to the requirements for the home
-        endpoint. The transformed data is then used to create a new Animal
-        object, which is returned.
+        endpoint (see transform_raw). The transformed data is then used to
+        create a new Animal object, which is returned.
 
         If any errors occur during transformation, the exception is caught,
         logged, and re-raised.
@@ -46,25 +103,36 @@ class AnimalTransformer:
             Animal: Transformed Animal record
         """
         try:
-            # Create a copy to avoid modifying the original
-            animal_dict = animal.to_dict()
-            
-            # Transform friends field
-            if 'friends' in animal_dict:
-                animal_dict['friends'] = self.transform_friends(animal_dict['friends'])
-            
-            # Transform born_at field  
-            if 'born_at' in animal_dict:
-                animal_dict['born_at'] = self.transform_born_at(animal_dict['born_at'])
+            # Transform a copy to avoid modifying the original
+            animal_dict = self.transform_raw(animal.to_dict())
             
             # Create new Animal instance with transformed data
             return Animal.from_dict(animal_dict)
             
         except Exception as e:
             logger.error(f"Error transforming animal {animal.id}: {e}")
-            self.stats['transformation_errors'] += 1
+            self._errors_n += 1
             raise
     
+    def transform_raw(self, animal_dict: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Transform a raw animal dict in place.
+
+        Applies the same field transformations as transform, but without
+        building Animal models, for callers that already hold a dict and
+        only need a dict back.
+
+        Args:
+            animal_dict (Dict[str, Any]): Animal data to transform (modified in place)
+
+        Returns:
+            Dict[str, Any]: The same dict with friends and born_at transformed
+        """
+        animal_dict['name'] = _intern(animal_dict.get('name'))
+        animal_dict['friends'] = self.transform_friends(animal_dict.get('friends'))
+        animal_dict['born_at'] = self.transform_born_at(animal_dict.get('born_at'))
+        return animal_dict
+    
     def transform_friends(self, friends: Union[str, List[str], None]) -> List[str]:
         """
         Transform friends field from either string (CSV) or list of strings into a
@@ -89,15 +157,35 @@ class AnimalTransformer:
             if not friends:
                 return []
             
+            # Exact type checks are cheapest; subclasses are matched with isinstance
+            friends_type = type(friends)
+            if friends_type is not str and friends_type is not list:
+                if isinstance(friends, str):
+                    friends_type = str
+                elif isinstance(friends, list):
+                    friends_type = list
+            
             # If already a list, clean and return
-            if isinstance(friends, list):
-                # Clean up any whitespace and filter out empty strings
-                cleaned_friends = [friend.strip() for friend in friends if friend and friend.strip()]
-                logger.debug(f"Friends already list: {len(cleaned_friends)} friends")
+            if friends_type is list:
+                # Already clean lists are returned without copying; names that
+                # aren't the interned copy yet are replaced in place as we check
+                for i, friend in enumerate(friends):
+                    if type(friend) is not str or not friend or friend != friend.strip():
+                        break
+                    interned = sys.intern(friend)
+                    if interned is not friend:
+                        friends[i] = interned
+                else:
+                    return friends
+                
+                # Clean up any whitespace and filter out empty strings, stripping each name once
+                cleaned_friends = [_intern(name) for name in (friend.strip() for friend in friends if friend) if name]
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Friends already list: {len(cleaned_friends)} friends")
                 return cleaned_friends
             
             # Handle string case (CSV)
-            if isinstance(friends, str):
+            if friends_type is str:
                 friends = friends.strip()
                 
                 # Handle empty string
@@ -105,14 +193,11 @@ class AnimalTransformer:
                     return []
                 
                 # Split by comma and clean up
-                friend_list = [
-                    friend.strip() 
-                    for friend in friends.split(',') 
-                    if friend.strip()
-                ]
+                friend_list = list(_parse_friends_csv(friends))
                 
-                self.stats['friends_transformed'] += 1
-                logger.debug(f"Transformed friends CSV '{friends}' to list: {friend_list}")
+                self._friends_n += 1
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Transformed friends CSV '{friends}' to list: {friend_list}")
                 return friend_list
             
             # Handle unexpected types
@@ -129,8 +214,9 @@ class AnimalTransformer:
 
         If the input is None or empty, None is returned. If the input is already a
         datetime object, it is converted to UTC and formatted as an ISO8601 string. If
-        the input is a string, it is parsed to a datetime using dateutil and then
-        converted to UTC and formatted as an ISO8601 string.
+        the input is a string, it is parsed to a datetime (fromisoformat, falling back
+        to dateutil) and then converted to UTC and formatted as an ISO8601 string.
+        Parsed strings are cached.
 
         If any errors occur during transformation, the exception is caught, logged, and
         re-raised.
@@ -146,49 +232,37 @@ class AnimalTransformer:
             if not born_at:
                 return None
             
+            # Exact type checks are cheapest; subclasses are matched with isinstance
+            born_at_type = type(born_at)
+            if born_at_type is not str and born_at_type is not datetime:
+                if isinstance(born_at, str):
+                    born_at_type = str
+                elif isinstance(born_at, datetime):
+                    born_at_type = datetime
+            
             # If already a datetime, convert to UTC and format
-            if isinstance(born_at, datetime):
-                # Convert to UTC if timezone-aware, assume UTC if naive
-                if born_at.tzinfo is None:
-                    # Naive datetime - assume it's already UTC
-                    utc_dt = born_at.replace(tzinfo=tz.UTC)
-                else:
-                    # Convert to UTC
-                    utc_dt = born_at.astimezone(tz.UTC)
-                
-                iso_string = utc_dt.strftime('%Y-%m-%dT%H:%M:%SZ')
-                self.stats['born_at_transformed'] += 1
-                logger.debug(f"Transformed datetime to ISO8601: {iso_string}")
+            if born_at_type is datetime:
+                # Naive datetimes are taken as UTC
+                iso_string = format_datetime_iso8601(born_at)
+                self._born_at_n += 1
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Transformed datetime to ISO8601: {iso_string}")
                 return iso_string
             
             # Handle string case
-            if isinstance(born_at, str):
+            if born_at_type is str:
                 born_at = born_at.strip()
                 
                 # Handle empty string
                 if not born_at:
                     return None
                 
-                try:
-                    # Parse the string to datetime using dateutil
-                    parsed_dt = dateutil.parser.parse(born_at)
-                    
-                    # Convert to UTC
-                    if parsed_dt.tzinfo is None:
-                        # Naive datetime - assume UTC
-                        utc_dt = parsed_dt.replace(tzinfo=tz.UTC)
-                    else:
-                        # Convert to UTC
-                        utc_dt = parsed_dt.astimezone(tz.UTC)
-                    
-                    iso_string = utc_dt.strftime('%Y-%m-%dT%H:%M:%SZ')
-                    self.stats['born_at_transformed'] += 1
-                    logger.debug(f"Transformed born_at '{born_at}' to ISO8601: {iso_string}")
-                    return iso_string
-                    
-                except (ValueError, TypeError, dateutil.parser.ParserError) as e:
-                    logger.error(f"Failed to parse born_at string '{born_at}': {e}")
-                    return None
+                iso_string = _parse_born_at(born_at)
+                if iso_string is not None:
+                    self._born_at_n += 1
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(f"Transformed born_at '{born_at}' to ISO8601: {iso_string}")
+                return iso_string
             
             # Handle unexpected types
             logger.warning(f"Unexpected born_at type: {type(born_at)}, attempting string conversion")
@@ -214,65 +288,172 @@ class AnimalTransformer:
         Returns:
             List[Animal]: List of transformed Animal objects
         """
-        transformed_animals = []
+        # Same steps as transform, inlined with the lookups hoisted out of the loop
+        transform_friends = self.transform_friends
+        transform_born_at = self.transform_born_at
+        from_dict = Animal.from_dict
+        
+        transformed_animals = [None] * len(animals)
+        count = 0
         
         for animal in animals:
             try:
-                transformed_animal = self.transform(animal)
-                transformed_animals.append(transformed_animal)
+                animal_dict = animal.to_dict()
+                animal_dict['name'] = _intern(animal_dict.get('name'))
+                animal_dict['friends'] = transform_friends(animal_dict.get('friends'))
+                animal_dict['born_at'] = transform_born_at(animal_dict.get('born_at'))
+                transformed_animals[count] = from_dict(animal_dict)
+                count += 1
             except Exception as e:
+                self._errors_n += 1
                 logger.error(f"Skipping animal {animal.id} due to transformation error: {e}")
                 # Continue processing other animals rather than failing the entire batch
                 continue
-                
+        
+        # Drop the unused slots left by skipped animals
+        del transformed_animals[count:]
         return transformed_animals
     
+    def transform_batch_df(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Transform a batch of raw animal dicts column-wise with pandas.
+
+        born_at strings are parsed in one vectorized pass and CSV friends are
+        split with a single string operation. Values the vectorized path can't
+        handle (non-ISO dates, non-string friends) fall back to the per-record
+        transforms, so the output matches transform_raw. Without pandas the
+        records are transformed one by one. pandas is imported on first use,
+        so it costs nothing unless this path is enabled. Like transform_raw,
+        the records are modified in place, so fields other than friends and
+        born_at pass through unchanged.
+
+        Args:
+            records (List[Dict[str, Any]]): Raw animal dicts to transform
+
+        Returns:
+            List[Dict[str, Any]]: Transformed animal dicts
+        """
+        try:
+            import pandas as pd
+        except ImportError:  # pandas is optional; fall back to the per-record path
+            pd = None
+        
+        if pd is None or not records:
+            return [self.transform_raw(record) for record in records]
+        
+        # Keep every column as Python objects: an inferred str dtype would turn None into NaN.
+        # Columns are built with .get, so a missing key is None (as in transform_raw), not NaN
+        df = pd.DataFrame({
+            'friends': [record.get('friends') for record in records],
+            'born_at': [record.get('born_at') for record in records],
+        }, dtype=object)
+        
+        # Friends: split CSV strings in one pass, clean everything else per record
+        friends = df['friends']
+        is_csv = friends.map(lambda value: isinstance(value, str))
+        friends = friends.astype(object)
+        friends[is_csv] = friends[is_csv].str.split(',').map(
+            lambda names: [s for s in (name.strip() for name in names) if s]
+        )
+        friends[~is_csv] = friends[~is_csv].map(self.transform_friends)
+        df['friends'] = friends
+        self._friends_n += int(is_csv.sum())
+        
+        # born_at: parse ISO8601 strings as a column, naive values are taken as UTC
+        born_at = df['born_at']
+        parsed = pd.to_datetime(born_at, utc=True, errors='coerce', format='ISO8601')
+        formatted = parsed.dt.strftime('%Y-%m-%dT%H:%M:%SZ').astype(object)
+        unparsed = parsed.isna()
+        formatted[unparsed] = born_at[unparsed].map(self.transform_born_at)
+        df['born_at'] = formatted.where(formatted.notna(), None)
+        self._born_at_n += int((~unparsed).sum())
+        
+        for record, record_friends, record_born_at in zip(records, df['friends'], df['born_at']):
+            record['name'] = _intern(record.get('name'))
+            record['friends'] = record_friends
+            record['born_at'] = record_born_at
+        return records
+    
     def get_stats(self) -> Dict[str, int]:
-        return self.stats.copy()
+        return {
+            'friends_transformed': self._friends_n,
+            'born_at_transformed': self._born_at_n,
+            'transformation_errors': self._errors_n
+        }
     
     def reset_stats(self):
-        self.stats = {
-            'friends_transformed': 0,
-            'born_at_transformed': 0,
-            'transformation_errors': 0
-        }
+        self._friends_n = 0
+        self._born_at_n = 0
+        self._errors_n = 0
+        _parse_friends_csv.cache_clear()
+        _parse_born_at.cache_clear()
     
     def validate_transformation(self, original: Animal, transformed: Animal) -> bool:
         try:
-            # Basic validation - ensure core fields are preserved
-            if original.id != transformed.id:
-                logger.error(f"ID mismatch: {original.id} != {transformed.id}")
-                return False
-                
-            if original.name != transformed.name:
-                logger.error(f"Name mismatch: {original.name} != {transformed.name}")
+            # Basic validation - ensure core fields are preserved (one tuple compare)
+            original_key = (original.id, original.name)
+            transformed_key = (transformed.id, transformed.name)
+            if original_key != transformed_key:
+                logger.error(f"Core field mismatch (id, name): {original_key} != {transformed_key}")
                 return False
             
-            # Validate friends transformation
-            if hasattr(transformed, 'friends') and transformed.friends is not None:
-                if not isinstance(transformed.friends, list):
-                    logger.error(f"Friends not transformed to list: {type(transformed.friends)}")
-                    return False
-            
-            # Validate born_at transformation
-            if hasattr(transformed, 'born_at') and transformed.born_at is not None:
-                if not isinstance(transformed.born_at, str):
-                    logger.error(f"born_at not transformed to string: {type(transformed.born_at)}")
-                    return False
-                
-                # Check if it's a valid ISO8601 format
-                try:
-                    datetime.fromisoformat(transformed.born_at.replace('Z', '+00:00'))
-                except ValueError:
-                    logger.error(f"born_at not in valid ISO8601 format: {transformed.born_at}")
-                    return False
-            
-            return True
+            return self._validate_transformed_fields(transformed)
             
         except Exception as e:
             logger.error(f"Error validating transformation: {e}")
             return False
+    
+    def validate_batch(self, originals: List[Animal], transformed: List[Animal]) -> bool:
+        """
+        Validate a batch of transformations.
+
+        Same checks as validate_transformation on each pair, but the core
+        fields of the whole batch are compared as two lists of (id, name)
+        tuples in one go. The per-pair check only runs to log a mismatch.
 
+        Args:
+            originals (List[Animal]): Animals before transformation
+            transformed (List[Animal]): The same animals after transformation, in order
+
+        Returns:
+            bool: True if every animal in the batch was transformed correctly
+        """
+        try:
+            if len(originals) != len(transformed):
+                logger.error(f"Batch size mismatch: {len(originals)} != {len(transformed)}")
+                return False
+            
+            if [(animal.id, animal.name) for animal in originals] != [(animal.id, animal.name) for animal in transformed]:
+                # Find and log the mismatching pair
+                return all(map(self.validate_transformation, originals, transformed))
+            
+            return all(map(self._validate_transformed_fields, transformed))
+            
+        except Exception as e:
+            logger.error(f"Error validating transformation batch: {e}")
+            return False
+    
+    def _validate_transformed_fields(self, transformed: Animal) -> bool:
+        # Validate friends transformation
+        if hasattr(transformed, 'friends') and transformed.friends is not None:
+            if not isinstance(transformed.friends, list):
+                logger.error(f"Friends not transformed to list: {type(transformed.friends)}")
+                return False
+        
+        # Validate born_at transformation
+        if hasattr(transformed, 'born_at') and transformed.born_at is not None:
+            if not isinstance(transformed.born_at, str):
+                logger.error(f"born_at not transformed to string: {type(transformed.born_at)}")
+                return False
+            
+            # Check it's in the ISO8601 format transform emits and is a real date;
+            # values transform produced are already in _parse_born_at's cache
+            born_at = transformed.born_at
+            if not _ISO_Z_RE.fullmatch(born_at) or _parse_born_at(born_at) != born_at:
+                logger.error(f"born_at not in valid ISO8601 format: {transformed.born_at}")
+                return False
+        
+        return True
 
 # class TransformationError(Exception):
 #     """Custom exception for transformation errors."""
@@ -1,41 +1,50 @@
 
+import asyncio
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from logging.handlers import MemoryHandler
+
+import aiohttp
 import pytest
+from yarl import URL
 from datetime import datetime
 from dateutil import tz
 
-from application.transformer import AnimalTransformer
-from Common.utils import normalize_csv_string, format_datetime_iso8601
-from Common.models import Animal
+from application.api_client import AnimalAPIClient, RetryConfig
+from Common.configs import _load_env
+from Common.logger import attach_to_listener, get_listener_queue, get_logger, start_queue_listener, stop_queue_listener
+from application.main import AnimalETLPipeline, _transform_chunk
+from application.transformer import AnimalTransformer, _parse_born_at
+from Common.utils import normalize_csv_string, format_datetime_iso8601, chunked
+from Common.models import Animal, AnimalRaw
 
 
 class TestAnimalTransformer:
     """Test cases for AnimalTransformer class."""
     
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.transformer = AnimalTransformer()
+    @pytest.fixture(scope="class")
+    @classmethod
+    def shared_transformer(cls):
+        """One transformer for the whole class."""
+        return AnimalTransformer()
+    
+    @pytest.fixture(autouse=True)
+    def transformer(self, shared_transformer):
+        """Give each test the shared transformer with fresh stats and caches."""
+        shared_transformer.reset_stats()
+        self.transformer = shared_transformer
+        return shared_transformer
     
-    def test_transform_friends_csv_string(self):
+    @pytest.mark.parametrize("raw, expected", [
+        ("Alice,Bob,Charlie", ["Alice", "Bob", "Charlie"]),  # Basic CSV string
+        ("Alice, Bob , Charlie ", ["Alice", "Bob", "Charlie"]),  # CSV with whitespace
+        ("Alice", ["Alice"]),  # Single friend
+        ("", []),  # Empty string
+        ("Alice,,Bob, ,Charlie", ["Alice", "Bob", "Charlie"]),  # String with empty items
+    ])
+    def test_transform_friends_csv_string(self, raw, expected):
         """Test transforming friends from CSV string."""
-        # Basic CSV string
-        result = self.transformer.transform_friends("Alice,Bob,Charlie")
-        assert result == ["Alice", "Bob", "Charlie"]
-        
-        # CSV with whitespace
-        result = self.transformer.transform_friends("Alice, Bob , Charlie ")
-        assert result == ["Alice", "Bob", "Charlie"]
-        
-        # Single friend
-        result = self.transformer.transform_friends("Alice")
-        assert result == ["Alice"]
-        
-        # Empty string
-        result = self.transformer.transform_friends("")
-        assert result == []
-        
-        # String with empty items
-        result = self.transformer.transform_friends("Alice,,Bob, ,Charlie")
-        assert result == ["Alice", "Bob", "Charlie"]
+        assert self.transformer.transform_friends(raw) == expected
     
     def test_transform_friends_list(self):
         """Test transforming friends when already a list."""
@@ -55,28 +64,30 @@ class TestAnimalTransformer:
         result = self.transformer.transform_friends([])
         assert result == []
     
+    def test_transform_friends_clean_list_is_interned(self):
+        """Test names in an already clean list are replaced by their interned copies."""
+        friends = ["".join(["Ali", "ce"]), "Bob"]
+        assert friends[0] is not sys.intern("Alice")
+        
+        result = self.transformer.transform_friends(friends)
+        
+        assert result is friends  # Still returned without copying
+        assert result[0] is sys.intern("Alice")
+    
     def test_transform_friends_none(self):
         """Test transforming friends when None."""
         result = self.transformer.transform_friends(None)
         assert result == []
     
-    def test_transform_born_at_string(self):
+    @pytest.mark.parametrize("raw, expected", [
+        ("2020-01-15T10:30:00Z", "2020-01-15T10:30:00Z"),  # ISO format
+        ("2020-01-15", "2020-01-15T00:00:00Z"),  # Date without time
+        ("2020-01-15T10:30:00-05:00", "2020-01-15T15:30:00Z"),  # With timezone, converted to UTC
+        ("2020-01-15 10:30:00", "2020-01-15T10:30:00Z"),  # Different format
+    ])
+    def test_transform_born_at_string(self, raw, expected):
         """Test transforming born_at from string."""
-        # ISO format
-        result = self.transformer.transform_born_at("2020-01-15T10:30:00Z")
-        assert result == "2020-01-15T10:30:00Z"
-        
-        # Date without time
-        result = self.transformer.transform_born_at("2020-01-15")
-        assert result == "2020-01-15T00:00:00Z"
-        
-        # With timezone
-        result = self.transformer.transform_born_at("2020-01-15T10:30:00-05:00")
-        assert result == "2020-01-15T15:30:00Z"  # Converted to UTC
-        
-        # Different format
-        result = self.transformer.transform_born_at("2020-01-15 10:30:00")
-        assert result == "2020-01-15T10:30:00Z"
+        assert self.transformer.transform_born_at(raw) == expected
     
     def test_transform_born_at_datetime(self):
         """Test transforming born_at from datetime object."""
@@ -115,6 +126,12 @@ class TestAnimalTransformer:
         result = self.transformer.transform_born_at("2020-13-45")  # Invalid date
         assert result is None
     
+    def test_transform_born_at_hour_24(self):
+        """Test an hour-24 string in the output format is not passed through as-is."""
+        result = self.transformer.transform_born_at("2020-01-15T24:00:00Z")
+        # ciso8601 reads hour 24 as the next midnight; fromisoformat rejects it
+        assert result in ("2020-01-16T00:00:00Z", None)
+    
     def test_transform_animal_complete(self):
         """Test transforming a complete animal."""
         animal_data = {
@@ -148,6 +165,46 @@ class TestAnimalTransformer:
         assert transformed.friends == ['Alice', 'Bob']
         assert transformed.born_at is None
     
+    def test_transform_raw(self):
+        """Test transforming a raw dict in place."""
+        animal_data = {'id': 1, 'name': 'Fluffy', 'friends': 'Alice, Bob', 'born_at': '2020-01-15'}
+        
+        result = self.transformer.transform_raw(animal_data)
+        
+        assert result is animal_data
+        assert result == {'id': 1, 'name': 'Fluffy', 'friends': ['Alice', 'Bob'], 'born_at': '2020-01-15T00:00:00Z'}
+
+    @pytest.mark.parametrize("records", [
+        [
+            {'id': 1, 'name': 'Fluffy', 'friends': 'Alice, Bob,,', 'born_at': '2020-01-15T10:30:00+05:00'},
+            {'id': 2, 'name': 'Rex', 'friends': [' Carl ', ''], 'born_at': 'January 15, 2020'},
+            {'id': 3, 'name': 'Tom', 'friends': None, 'born_at': None},
+            {'id': 4, 'name': 'Kit', 'friends': '', 'born_at': 'invalid-date'},
+        ],
+        # Only CSV strings and None, so pandas would infer a str column
+        [
+            {'id': 1, 'name': 'Fluffy', 'friends': None, 'born_at': None},
+            {'id': 2, 'name': 'Rex', 'friends': 'x,y', 'born_at': '2020-01-15'},
+        ],
+        # Extra API fields on some records only
+        [
+            {'id': 1, 'name': 'Fluffy', 'friends': 'x', 'born_at': None, 'species': 'cat'},
+            {'id': 2, 'name': 'Rex', 'friends': None, 'born_at': None},
+        ],
+        # Records missing the friends or born_at key
+        [
+            {'id': 1, 'name': 'Fluffy', 'born_at': '2020-01-15'},
+            {'id': 2, 'name': 'Rex', 'friends': 'x,y'},
+        ],
+    ])
+    def test_transform_batch_df_matches_transform_raw(self, records):
+        """Test the column-wise batch transform gives the same output as transform_raw."""
+        pytest.importorskip("pandas")
+        
+        result = self.transformer.transform_batch_df([dict(record) for record in records])
+
+        assert result == [self.transformer.transform_raw(dict(record)) for record in records]
+
     def test_transform_batch(self):
         """Test transforming a batch of animals."""
         animals_data = [
@@ -183,6 +240,20 @@ class TestAnimalTransformer:
         stats = self.transformer.get_stats()
         assert stats['born_at_transformed'] == 1
     
+    def test_repeated_values_are_cached(self):
+        """Test that repeated raw values are parsed once and results aren't shared."""
+        self.transformer.reset_stats()
+        
+        first = self.transformer.transform_friends("Alice,Bob")
+        first.append("Mallory")
+        second = self.transformer.transform_friends("Alice,Bob")
+        assert second == ["Alice", "Bob"]
+        
+        self.transformer.transform_born_at("2020-01-15")
+        self.transformer.transform_born_at("2020-01-15")
+        assert _parse_born_at.cache_info().hits == 1
+        assert self.transformer.get_stats()['born_at_transformed'] == 2
+    
     def test_validation_success(self):
         """Test successful transformation validation."""
         original_data = {
@@ -209,18 +280,42 @@ class TestAnimalTransformer:
         
         is_valid = self.transformer.validate_transformation(original, transformed)
         assert is_valid is False
+        
+        # born_at not in the output ISO8601 format
+        transformed = Animal.from_dict({'id': 1, 'name': 'Fluffy', 'born_at': '2020-01-15'})
+        assert self.transformer.validate_transformation(original, transformed) is False
+        
+        # In the output format but not a real date or time
+        for born_at in ('2020-13-45T10:30:00Z', '2020-02-30T99:99:99Z'):
+            transformed = Animal.from_dict({'id': 1, 'name': 'Fluffy', 'born_at': born_at})
+            assert self.transformer.validate_transformation(original, transformed) is False
+
+    def test_validate_batch(self):
+        """Test validating a whole batch of transformations."""
+        originals = [
+            Animal.from_dict({'id': 1, 'name': 'Fluffy', 'friends': 'Alice,Bob', 'born_at': '2020-01-15'}),
+            Animal.from_dict({'id': 2, 'name': 'Rex'}),
+        ]
+        transformed = self.transformer.transform_batch(originals)
+        
+        assert self.transformer.validate_batch(originals, transformed) is True
+        assert self.transformer.validate_batch(originals, transformed[:1]) is False
+        assert self.transformer.validate_batch(originals, transformed[::-1]) is False
 
 
 class TestUtilityFunctions:
     """Test utility functions."""
     
-    def test_normalize_csv_string(self):
+    @pytest.mark.parametrize("raw, expected", [
+        ("a,b,c", ["a", "b", "c"]),
+        ("a, b , c ", ["a", "b", "c"]),
+        ("a,,b", ["a", "b"]),
+        ("", []),
+        ("   ", []),
+    ])
+    def test_normalize_csv_string(self, raw, expected):
         """Test CSV string normalization."""
-        assert normalize_csv_string("a,b,c") == ["a", "b", "c"]
-        assert normalize_csv_string("a, b , c ") == ["a", "b", "c"]
-        assert normalize_csv_string("a,,b") == ["a", "b"]
-        assert normalize_csv_string("") == []
-        assert normalize_csv_string("   ") == []
+        assert normalize_csv_string(raw) == expected
     
     def test_format_datetime_iso8601(self):
         """Test ISO8601 datetime formatting."""
@@ -233,6 +328,301 @@ class TestUtilityFunctions:
         dt = datetime(2020, 1, 15, 10, 30, 0)
         result = format_datetime_iso8601(dt)
         assert result == "2020-01-15T10:30:00Z"
+    
+    def test_chunked(self):
+        """Test splitting an iterable into fixed-size batches."""
+        assert list(chunked([1, 2, 3, 4, 5], 2)) == [[1, 2], [3, 4], [5]]
+        assert list(chunked(iter(range(3)), 3)) == [[0, 1, 2]]
+        assert list(chunked([], 2)) == []
+
+
+class TestAnimalModel:
+    """Test cases for the Animal model."""
+    
+    def test_animal_raw_round_trip(self):
+        """Test that AnimalRaw keeps the declared fields and passes the rest through."""
+        data = {'id': 1, 'name': 'Fluffy', 'friends': 'Alice,Bob', 'born_at': None, 'extra': 'x', 'species': 'cat'}
+        
+        raw = AnimalRaw.from_dict(data)
+        
+        assert not hasattr(raw, '__dict__')
+        assert raw.extra == {'extra': 'x', 'species': 'cat'}
+        assert raw.to_dict() == data
+        assert AnimalRaw.from_dict({'id': 2, 'name': 'Rex'}).extra == {}
+
+
+class TestRetryConfig:
+    """Test cases for RetryConfig."""
+    
+    def test_sub_second_delays_from_env(self, monkeypatch):
+        """Test that fractional delays from the environment are not truncated."""
+        monkeypatch.setenv("BASE_DELAY", "0.5")
+        monkeypatch.setenv("BACKOFF_FACTOR", "1.5")
+        _load_env.cache_clear()  # Re-snapshot the environment with the patched values
+        
+        try:
+            config = RetryConfig()
+        finally:
+            monkeypatch.undo()
+            _load_env.cache_clear()
+        
+        assert config.base_delay == 0.5
+        assert config.backoff_factor == 1.5
+    
+    def test_delay_schedule(self):
+        """Test that the backoff schedule is precomputed and capped."""
+        config = RetryConfig(max_attempts=5, base_delay=1, max_delay=5, backoff_factor=2)
+        assert config.delays == [1, 2, 4, 5]
+
+
+class TestHTTP2Request:
+    """Test cases for requests sent through the HTTP/2 client."""
+
+    def test_error_status_is_kept(self):
+        """Test a failed HTTP/2 request raises ClientResponseError with its status."""
+        httpx = pytest.importorskip("httpx")
+
+        async def run():
+            client = AnimalAPIClient("http://test")
+            client.http2_client = httpx.AsyncClient(
+                transport=httpx.MockTransport(lambda request: httpx.Response(429, text="slow down"))
+            )
+            try:
+                await client._http2_request("POST", "http://test/animals/v1/home", data=b"[]")
+            finally:
+                await client.close()
+
+        with pytest.raises(aiohttp.ClientResponseError) as exc_info:
+            asyncio.run(run())
+        assert exc_info.value.status == 429
+        assert exc_info.value.request_info.method == "POST"
+
+
+class TestQueueLogging:
+    """Test cases for moving log output onto the listener thread."""
+
+    def test_listener_swaps_and_restores_handlers(self):
+        """Test the logger writes through a queue while the listener runs."""
+        logger = get_logger()
+        collector = MemoryHandler(capacity=100)
+        logger.addHandler(collector)
+        handlers = list(logger.handlers)
+
+        try:
+            start_queue_listener()
+            try:
+                assert [type(handler).__name__ for handler in logger.handlers] == ['QueueHandler']
+                logger.warning("queued message")
+            finally:
+                stop_queue_listener()
+
+            assert logger.handlers == handlers
+            assert [record.getMessage() for record in collector.buffer] == ["queued message"]
+        finally:
+            logger.removeHandler(collector)
+
+    def test_worker_records_reach_the_listener(self):
+        """Test a pool worker's records are written once, by this process."""
+        logger = get_logger()
+        collector = MemoryHandler(capacity=100)
+        logger.addHandler(collector)
+
+        try:
+            start_queue_listener()
+            try:
+                logger.warning("parent message")
+                with ProcessPoolExecutor(
+                    max_workers=1,
+                    initializer=attach_to_listener,
+                    initargs=(get_listener_queue(),)
+                ) as pool:
+                    pool.submit(logger.error, "worker message").result()
+            finally:
+                stop_queue_listener()
+
+            assert [record.getMessage() for record in collector.buffer] == ["parent message", "worker message"]
+        finally:
+            logger.removeHandler(collector)
+
+
+class TestPipelineTransform:
+    """Test cases for the pipeline's transform step."""
+    
+    def test_transform_chunk(self):
+        """Test transforming a chunk of raw records into output dicts."""
+        animals = [
+            AnimalRaw.from_dict({'id': 1, 'name': 'Fluffy', 'friends': 'Alice, Bob', 'born_at': '2020-01-15'}),
+            AnimalRaw.from_dict({'id': 2, 'name': 'Rex', 'friends': None, 'born_at': None}),
+        ]
+        
+        result = _transform_chunk(animals)
+        
+        assert result == [
+            {'id': 1, 'name': 'Fluffy', 'friends': ['Alice', 'Bob'], 'born_at': '2020-01-15T00:00:00Z'},
+            {'id': 2, 'name': 'Rex', 'friends': [], 'born_at': None},
+        ]
+
+    def test_transform_chunk_skips_invalid_records(self):
+        """Test malformed records are dropped, and coercible ones fixed, before loading."""
+        animals = [
+            AnimalRaw.from_dict({'id': 1}),
+            AnimalRaw.from_dict({'id': 'abc', 'name': 'Rex', 'friends': None, 'born_at': None}),
+            AnimalRaw.from_dict({'id': '3', 'name': 'Tom', 'friends': 'Alice', 'born_at': None}),
+            AnimalRaw.from_dict({'id': 4, 'name': 'Kit', 'friends': None, 'born_at': None}),
+        ]
+        
+        result = _transform_chunk(animals)
+        
+        assert result == [
+            {'id': 3, 'name': 'Tom', 'friends': ['Alice'], 'born_at': None},
+            {'id': 4, 'name': 'Kit', 'friends': [], 'born_at': None},
+        ]
+
+
+class TestPipelineProduce:
+    """Test cases for the pipeline's list page producer."""
+
+    class BrokenStreamClient:
+        """List endpoint stub whose streamed pages break off after the first item."""
+
+        def __init__(self, list_fails=False):
+            self.list_fails = list_fails
+            self.list_calls = 0
+
+        async def iter_animals(self, page, per_page):
+            yield {'id': page * 10}
+            raise aiohttp.ClientPayloadError("Response payload is not completed")
+
+        async def list_animals(self, page, per_page):
+            self.list_calls += 1
+            if self.list_fails:
+                raise aiohttp.ClientError("All retry attempts failed")
+            items = [{'id': page * 10 + i} for i in range(3)] if page == 1 else []
+            return {'items': items}
+
+    def test_broken_stream_refetches_page(self):
+        """Test a page whose stream breaks off is fetched again in full, without the partial IDs."""
+        pipeline = AnimalETLPipeline()
+        pipeline.api_client = self.BrokenStreamClient()
+
+        assert asyncio.run(pipeline._fetch_page_ids(1)) == (10, 11, 12)
+        assert pipeline.api_client.list_calls == 1
+
+    def test_producer_failure_is_recorded(self):
+        """Test a page that can't be fetched at all is reported in the run's errors."""
+        pipeline = AnimalETLPipeline()
+        pipeline.api_client = self.BrokenStreamClient(list_fails=True)
+        stats = {'errors': []}
+
+        asyncio.run(pipeline._produce_animal_ids(asyncio.Queue(), stats))
+
+        assert stats['errors'] == ["Producer failed on page 1: All retry attempts failed"]
+
+
+class TestPipelineFetch:
+    """Test cases for the pipeline's detail fetch step."""
+
+    class CountingClient:
+        """Details endpoint stub that counts requests per animal ID."""
+
+        def __init__(self):
+            self.requests = {}
+
+        async def get_animal_details(self, animal_id):
+            self.requests[animal_id] = self.requests.get(animal_id, 0) + 1
+            await asyncio.sleep(0)
+            return {'id': animal_id, 'name': f'Animal {animal_id}'}
+
+    def test_repeated_ids_are_fetched_once(self):
+        """Test duplicate IDs, concurrent or in a later batch, share one request."""
+        pipeline = AnimalETLPipeline()
+        pipeline.api_client = self.CountingClient()
+
+        async def fetch(animal_ids):
+            return [animal.id async for animal in pipeline._iter_animal_details(animal_ids)]
+
+        async def run():
+            return await fetch((1, 2, 1)), await fetch((2, 3))
+
+        first, second = asyncio.run(run())
+
+        assert sorted(first) == [1, 1, 2]
+        assert sorted(second) == [2, 3]
+        assert pipeline.api_client.requests == {1: 1, 2: 1, 3: 1}
+
+
+class TestPipelineLoad:
+    """Test cases for the pipeline's load step."""
+
+    class ThrottlingClient:
+        """Home endpoint stub that answers 429 to requests sent while another is in flight."""
+        MAX_LOAD_BATCH_SIZE = 100
+        URL = URL("http://localhost:3123/animals/v1/home")
+
+        def __init__(self):
+            self.loaded = []
+            self.in_flight = 0
+
+        async def load_animals_home(self, animals):
+            self.in_flight += 1
+            try:
+                await asyncio.sleep(0)
+                if self.in_flight > 1:
+                    request_info = aiohttp.RequestInfo(self.URL, "POST", {}, self.URL)
+                    raise aiohttp.ClientResponseError(request_info, (), status=429, message="Too Many Requests")
+                self.loaded.extend(animal['id'] for animal in animals)
+                return {}
+            finally:
+                self.in_flight -= 1
+
+    def test_parallel_load_falls_back_when_throttled(self):
+        """Test rejected shards are resent one at a time and parallel loading is turned off."""
+        pipeline = AnimalETLPipeline(concurrency=4)
+        pipeline.api_client = self.ThrottlingClient()
+        animals = [{'id': i} for i in range(20)]
+
+        stats = {'errors': []}
+
+        loaded = asyncio.run(pipeline._load_batch(animals, stats))
+
+        assert loaded == 20
+        assert sorted(pipeline.api_client.loaded) == list(range(20))
+        assert pipeline.parallel_load is False
+        assert stats['errors'] == []
+
+    def test_small_batch_uses_at_most_concurrency_shards(self):
+        """Test a small batch is split into at most concurrency shards, not one per animal."""
+        class RecordingClient(self.ThrottlingClient):
+            async def load_animals_home(self, animals):
+                self.loaded.append([animal['id'] for animal in animals])
+                return {}
+
+        pipeline = AnimalETLPipeline(concurrency=5)
+        pipeline.api_client = RecordingClient()
+
+        loaded = asyncio.run(pipeline._load_batch([{'id': i} for i in range(9)], {'errors': []}))
+
+        assert loaded == 9
+        assert pipeline.api_client.loaded == [[0, 1], [2, 3], [4, 5], [6, 7], [8]]
+
+    def test_failed_shard_counts_only_loaded_animals(self):
+        """Test a failed shard is recorded and the other shards still count as loaded."""
+        class FailingClient(self.ThrottlingClient):
+            async def load_animals_home(self, animals):
+                if animals[0]['id'] == 0:
+                    raise aiohttp.ClientError("connection reset")
+                self.loaded.extend(animal['id'] for animal in animals)
+                return {}
+
+        pipeline = AnimalETLPipeline(concurrency=4)
+        pipeline.api_client = FailingClient()
+        stats = {'errors': []}
+
+        loaded = asyncio.run(pipeline._load_batch([{'id': i} for i in range(20)], stats))
+
+        assert loaded == 15
+        assert sorted(pipeline.api_client.loaded) == list(range(5, 20))
+        assert stats['errors'] == ["Load failed for 5 animals: connection reset"]
 
 
 if __name__ == "__main__":